@@ -34,9 +34,34 @@ for var in variables_to_check:
     else:
         print(f"❌ {var}: NOT SET")
 
+# Scan the environment once, sorting each variable into every bucket we report on
+ntfy_vars = {}
+topic_vars = {}
+github_vars = []
+python_vars = []
+system_vars = []
+app_vars = []
+
+for key, value in os.environ.items():
+    upper_key = key.upper()
+    if 'NTFY' in upper_key:
+        ntfy_vars[key] = value
+    if 'TOPIC' in upper_key:
+        topic_vars[key] = value
+    
+    # Categorize variables
+    if key.startswith(('GITHUB_', 'RUNNER_')):
+        github_vars.append(key)
+    elif key.startswith(('PYTHON', 'PIP_', 'PKG_CONFIG')):
+        python_vars.append(key)
+    elif key in ['PATH', 'HOME', 'USER', 'SHELL', 'TERM', 'LANG', 'LC_ALL', 'TZ']:
+        system_vars.append(key)
+    else:
+        # These are likely our app-specific variables
+        app_vars.append(key)
+
 print("\n" + "=" * 40)
 print("All environment variables containing 'NTFY':")
-ntfy_vars = {k: v for k, v in os.environ.items() if 'NTFY' in k.upper()}
 if ntfy_vars:
     for k, v in ntfy_vars.items():
         print(f"  {k}: {v}")
@@ -44,7 +69,6 @@ else:
     print("  None found")
 
 print("\nAll environment variables containing 'TOPIC':")
-topic_vars = {k: v for k, v in os.environ.items() if 'TOPIC' in k.upper()}
 if topic_vars:
     for k, v in topic_vars.items():
         print(f"  {k}: {v}")
@@ -57,25 +81,8 @@ print("ALL ENVIRONMENT VARIABLE NAMES:")
 print("(This helps debug what GitHub Actions is actually setting)")
 print()
 
-# Categorize environment variables
-github_vars = []
-python_vars = []
-system_vars = []
-app_vars = []
-
-for key in sorted(os.environ.keys()):
-    value = os.environ[key]
-    
-    # Categorize variables
-    if key.startswith(('GITHUB_', 'RUNNER_')):
-        github_vars.append(key)
-    elif key.startswith(('PYTHON', 'PIP_', 'PKG_CONFIG')):
-        python_vars.append(key)
-    elif key in ['PATH', 'HOME', 'USER', 'SHELL', 'TERM', 'LANG', 'LC_ALL', 'TZ']:
-        system_vars.append(key)
-    else:
-        # These are likely our app-specific variables
-        app_vars.append(key)
+for bucket in (github_vars, python_vars, system_vars, app_vars):
+    bucket.sort()
 
 print("🔧 APPLICATION/CUSTOM VARIABLES:")
 if app_vars:
@@ -13,8 +13,11 @@ import os
 from dotenv import load_dotenv
 import tweepy
 
-# Load environment variables
-load_dotenv()
+def mask_credential(cred):
+    """Partially mask a credential for display"""
+    if len(cred) > 8:
+        return cred[:4] + '*' * (len(cred) - 8) + cred[-4:]
+    return '*' * len(cred)
 
 def test_twitter_auth():
     """Test Twitter API authentication"""
@@ -46,12 +49,6 @@ def test_twitter_auth():
         print("\nPlease set these environment variables in your .env file")
         return False
     
-    # Partially mask credentials for display
-    def mask_credential(cred):
-        if len(cred) > 8:
-            return cred[:4] + '*' * (len(cred) - 8) + cred[-4:]
-        return '*' * len(cred)
-    
     print("✅ Found credentials:")
     print(f"   API Key: {mask_credential(api_key)}")
     print(f"   API Secret: {mask_credential(api_secret)}")
@@ -116,5 +113,7 @@ def test_twitter_auth():
         return False
 
 if __name__ == "__main__":
+    # Load environment variables (only when run as a script, not on import)
+    load_dotenv()
     success = test_twitter_auth()
     exit(0 if success else 1) 
\ No newline at end of file
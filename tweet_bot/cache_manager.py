@@ -2,160 +2,538 @@
 SQLite cache manager for tracking tweeted posts and preventing redundancy
 """
 
+import atexit
+import logging
+import queue
 import sqlite3
 import json
-from datetime import datetime, timedelta
+import threading
+import time
+import zlib
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
+from .config import encode_style, decode_style
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever existing databases need migrating (see _migrate)
+SCHEMA_VERSION = 2
+
+SECONDS_PER_DAY = 86400
+
+# Seconds a get_recently_tweeted_urls result is reused for
+RECENT_URLS_TTL = 60
+
+# Most queued tweet logs the writer thread commits in one transaction
+WRITE_BATCH_SIZE = 50
+
+# Compact JSON (no spaces after ',' and ':') for stored values
+_JSON_SEPARATORS = (',', ':')
+
+# Statements run on every bot run. sqlite3 already caches compiled statements
+# per connection by SQL text (128 by default), so these constants just keep the
+# SQL in one place; they don't change what gets reused.
+_SQL_RECENT_URLS = '''
+    SELECT post_url FROM tweeted_posts
+    WHERE last_tweeted_at >= ?
+'''
+
+_SQL_PREV_TWEETS = '''
+    SELECT tweet_text, style_params, tweeted_at
+    FROM tweet_history
+    WHERE post_url = ? AND success = TRUE
+    ORDER BY tweeted_at DESC
+    LIMIT ?
+'''
+
+# Upsert: first_tweeted_at is only written for a new post, repeats just
+# bump the count, with one index lookup on post_url
+_SQL_LOG_POST = '''
+    INSERT INTO tweeted_posts
+    (post_url, post_title, first_tweeted_at, last_tweeted_at, tweet_count)
+    VALUES (?, ?, ?, ?, 1)
+    ON CONFLICT (post_url) DO UPDATE SET
+        post_title = excluded.post_title,
+        last_tweeted_at = excluded.last_tweeted_at,
+        tweet_count = tweeted_posts.tweet_count + 1
+'''
+
+_SQL_LOG_HISTORY = '''
+    INSERT INTO tweet_history
+    (post_url, tweet_text, tweet_id, tweeted_at, style_params, success, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
 class CacheManager:
     """Manages SQLite cache for tweet history and post tracking"""
     
     def __init__(self, db_path: str = 'cache.db'):
         self.db_path = Path(db_path)
+        
+        # One connection for the life of the bot, so calls don't each pay for
+        # opening the file and re-reading the schema
+        self._conn = self._connect()
+        
+        # The sitemap snapshot is read and written from the thread that
+        # downloads the sitemap, while the main thread may hold a transaction
+        # open on _conn, so it gets a connection of its own (opened on first use)
+        self._sitemap_conn: Optional[sqlite3.Connection] = None
+        self._sitemap_lock = threading.Lock()
+        
+        # (monotonic time, cooldown_days, urls) from the last cooldown query
+        self._recent_cache: Optional[Tuple[float, int, set]] = None
+        
+        # Tweet logs are committed by a background thread on its own
+        # connection, so callers don't wait on the disk. WAL lets it write
+        # while this connection reads.
+        self._write_queue: queue.Queue = queue.Queue()
+        # Last failure in the writer thread, raised to the caller by flush()/close()
+        self._write_error: Optional[BaseException] = None
+        self._writer = threading.Thread(target=self._write_loop, name='cache-writer', daemon=True)
+        
+        # Closing checkpoints the WAL back into the database file, which has
+        # to happen before the workflow commits cache.db
+        atexit.register(self.close)
+        
         self._init_database()
+        self._writer.start()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open an autocommit connection with the per-connection PRAGMAs applied"""
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        
+        # synchronous=NORMAL skips most fsyncs under WAL; temp tables and
+        # sorts stay in memory
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')  # ~64MB
+        return conn
+    
+    def flush(self):
+        """Wait until every queued tweet log has been written, raising if any write failed"""
+        self._write_queue.join()
+        self._raise_write_error()
+    
+    def close(self):
+        """Write any queued tweet logs and close the database, raising if any write failed"""
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
+        with self._sitemap_lock:
+            if self._sitemap_conn is not None:
+                self._sitemap_conn.close()
+                self._sitemap_conn = None
+        self._conn.close()
+        self._raise_write_error()
+    
+    def _raise_write_error(self):
+        """Re-raise a writer thread failure in the calling thread (once)"""
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+    
+    @contextmanager
+    def _transaction(self, conn: Optional[sqlite3.Connection] = None):
+        """Run the enclosed statements as one write transaction (one sync on commit)"""
+        conn = conn or self._conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn.cursor()
+            conn.execute('COMMIT')
+        except BaseException:
+            # Also covers a failed COMMIT (e.g. SQLITE_BUSY), which leaves the
+            # transaction open; SQLite may already have rolled it back itself
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+    
+    @contextmanager
+    def session(self):
+        """Run the enclosed cache reads against one snapshot in a single read transaction"""
+        self.flush()
+        self._conn.execute('BEGIN')
+        try:
+            yield self
+        finally:
+            self._conn.execute('COMMIT')
     
     def _init_database(self):
         """Initialize the SQLite database with required tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Table for tracking posts we've tweeted about
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS tweeted_posts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    post_url TEXT UNIQUE NOT NULL,
-                    post_title TEXT,
-                    first_tweeted_at DATETIME,
-                    last_tweeted_at DATETIME,
-                    tweet_count INTEGER DEFAULT 1,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        cursor = self._conn.cursor()
+        
+        # WAL lets reads run alongside a write (stored in the file, so set once)
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
+        cursor.execute('PRAGMA user_version')
+        version = cursor.fetchone()[0]
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tweet_history'")
+        is_new = cursor.fetchone() is None
+        
+        # Let cleanup_old_data hand freed pages back to the filesystem. The
+        # mode only takes effect once the file is rebuilt, so existing
+        # databases get a single VACUUM the first time through.
+        cursor.execute('PRAGMA auto_vacuum')
+        if cursor.fetchone()[0] != 2:  # 2 = INCREMENTAL
+            cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            cursor.execute('VACUUM')
+        
+        # Table for tracking posts we've tweeted about
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tweeted_posts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                post_url TEXT UNIQUE NOT NULL,
+                post_title TEXT,
+                first_tweeted_at INTEGER,  -- Unix epoch seconds
+                last_tweeted_at INTEGER,
+                tweet_count INTEGER DEFAULT 1,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Table for tracking actual tweets sent. post_url has no foreign key:
+        # each row is written in the same transaction as its tweeted_posts
+        # upsert, so the check would only cost a lookup per insert.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tweet_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                post_url TEXT NOT NULL,
+                tweet_text TEXT NOT NULL,
+                tweet_id TEXT,
+                tweeted_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),  -- Unix epoch seconds
+                style_params INTEGER,  -- style code (config.encode_style), or JSON text
+                success BOOLEAN DEFAULT TRUE,
+                error_message TEXT
+            )
+        ''')
+        
+        # Last sitemap download, so unchanged sitemaps can be revalidated
+        # with a conditional GET instead of downloaded again
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sitemap_cache (
+                sitemap_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                posts BLOB NOT NULL,  -- zlib-compressed JSON list of parsed posts
+                fetched_at INTEGER  -- Unix epoch seconds
+            )
+        ''')
+        
+        if version < SCHEMA_VERSION:
+            if is_new:
+                cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            else:
+                self._migrate(version)
+        
+        # Index for performance
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_post_url ON tweeted_posts (post_url)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_tweeted_at ON tweet_history (tweeted_at)
+        ''')
+        
+        # Covers get_recently_tweeted_urls: a range scan over the index alone
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_last_tweeted_url
+            ON tweeted_posts (last_tweeted_at, post_url)
+        ''')
+        
+        # Serves get_previous_tweets' filter and ordering straight from the index
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_history_url_success_time
+            ON tweet_history (post_url, success, tweeted_at DESC)
+        ''')
+        
+        # Running totals for get_stats, kept current by triggers so the
+        # counts never need a table scan. Seeded from the existing rows the
+        # first time, in the same transaction the triggers are created in.
+        with self._transaction() as tx:
+            tx.execute('''
+                CREATE TABLE IF NOT EXISTS stats (
+                    key TEXT PRIMARY KEY,
+                    val INTEGER NOT NULL
                 )
             ''')
-            
-            # Table for tracking actual tweets sent
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS tweet_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    post_url TEXT NOT NULL,
-                    tweet_text TEXT NOT NULL,
-                    tweet_id TEXT,
-                    tweeted_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    style_params TEXT,  -- JSON of style choices used
-                    success BOOLEAN DEFAULT TRUE,
-                    error_message TEXT,
-                    FOREIGN KEY (post_url) REFERENCES tweeted_posts (post_url)
-                )
+            tx.execute('''
+                CREATE TRIGGER IF NOT EXISTS stats_post_added AFTER INSERT ON tweeted_posts
+                BEGIN
+                    UPDATE stats SET val = val + 1 WHERE key = 'total_posts';
+                END
             ''')
-            
-            # Index for performance
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_post_url ON tweeted_posts (post_url)
+            tx.execute('''
+                CREATE TRIGGER IF NOT EXISTS stats_post_removed AFTER DELETE ON tweeted_posts
+                BEGIN
+                    UPDATE stats SET val = val - 1 WHERE key = 'total_posts';
+                END
             ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_tweeted_at ON tweet_history (tweeted_at)
+            tx.execute('''
+                CREATE TRIGGER IF NOT EXISTS stats_tweet_added AFTER INSERT ON tweet_history
+                WHEN NEW.success
+                BEGIN
+                    UPDATE stats SET val = val + 1 WHERE key = 'total_tweets';
+                END
+            ''')
+            tx.execute('''
+                CREATE TRIGGER IF NOT EXISTS stats_tweet_removed AFTER DELETE ON tweet_history
+                WHEN OLD.success
+                BEGIN
+                    UPDATE stats SET val = val - 1 WHERE key = 'total_tweets';
+                END
+            ''')
+            tx.execute('''
+                INSERT OR IGNORE INTO stats (key, val)
+                SELECT 'total_posts', COUNT(*) FROM tweeted_posts
             ''')
+            tx.execute('''
+                INSERT OR IGNORE INTO stats (key, val)
+                SELECT 'total_tweets', COUNT(*) FROM tweet_history WHERE success = TRUE
+            ''')
+    
+    def _migrate(self, version: int):
+        """Bring a database written by an older version up to SCHEMA_VERSION"""
+        with self._transaction() as cursor:
+            if version < 1:
+                # Timestamps were ISO strings of naive local time; store them as
+                # epoch seconds so range checks are integer comparisons
+                for column in ('first_tweeted_at', 'last_tweeted_at'):
+                    cursor.execute(f'''
+                        UPDATE tweeted_posts
+                        SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER)
+                        WHERE typeof({column}) = 'text'
+                    ''')
+                
+                # tweet_history is rebuilt as well: style_params needs INTEGER
+                # affinity for style codes to be stored as numbers (legacy JSON
+                # stays text). Its indexes and triggers are recreated by
+                # _init_database once this returns.
+                cursor.execute('''
+                    CREATE TABLE tweet_history_new (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        post_url TEXT NOT NULL,
+                        tweet_text TEXT NOT NULL,
+                        tweet_id TEXT,
+                        tweeted_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                        style_params INTEGER,
+                        success BOOLEAN DEFAULT TRUE,
+                        error_message TEXT
+                    )
+                ''')
+                cursor.execute('''
+                    INSERT INTO tweet_history_new
+                    (id, post_url, tweet_text, tweet_id, tweeted_at, style_params, success, error_message)
+                    SELECT id, post_url, tweet_text, tweet_id,
+                           CAST(strftime('%s', tweeted_at, 'utc') AS INTEGER),
+                           style_params, success, error_message
+                    FROM tweet_history
+                ''')
+                cursor.execute('DROP TABLE tweet_history')
+                cursor.execute('ALTER TABLE tweet_history_new RENAME TO tweet_history')
+            
+            if version < 2:
+                # Snapshots used to be plain JSON text. Only a cache; the next
+                # run downloads the sitemap again.
+                cursor.execute('DELETE FROM sitemap_cache')
             
-            conn.commit()
+            cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
     
     def get_recently_tweeted_urls(self, cooldown_days: int) -> set:
         """Get URLs that were tweeted within the cooldown period"""
-        cutoff_date = datetime.now() - timedelta(days=cooldown_days)
+        if self._recent_cache is not None:
+            cached_at, cached_days, urls = self._recent_cache
+            if cached_days == cooldown_days and time.monotonic() - cached_at < RECENT_URLS_TTL:
+                return urls
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT post_url FROM tweeted_posts 
-                WHERE last_tweeted_at >= ?
-            ''', (cutoff_date,))
-            
-            return {row[0] for row in cursor.fetchall()}
+        cutoff = int(time.time()) - cooldown_days * SECONDS_PER_DAY
+        
+        self.flush()
+        cursor = self._conn.cursor()
+        cursor.execute(_SQL_RECENT_URLS, (cutoff,))
+        
+        urls = {row[0] for row in cursor}
+        self._recent_cache = (time.monotonic(), cooldown_days, urls)
+        return urls
     
     def get_previous_tweets(self, post_url: str, limit: int = 3) -> List[Dict]:
         """Get the last N tweets for a specific post"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT tweet_text, style_params, tweeted_at 
-                FROM tweet_history 
-                WHERE post_url = ? AND success = TRUE
-                ORDER BY tweeted_at DESC 
-                LIMIT ?
-            ''', (post_url, limit))
-            
-            tweets = []
-            for row in cursor.fetchall():
-                style_params = json.loads(row[1]) if row[1] else {}
-                tweets.append({
-                    'tweet_text': row[0],
-                    'style_params': style_params,
-                    'tweeted_at': row[2]
-                })
-            
-            return tweets
+        self.flush()
+        cursor = self._conn.cursor()
+        cursor.execute(_SQL_PREV_TWEETS, (post_url, limit))
+        
+        tweets = []
+        for row in cursor:
+            tweets.append({
+                'tweet_text': row[0],
+                'style_params': decode_style(row[1]),
+                'tweeted_at': row[2]
+            })
+        
+        return tweets
     
-    def log_tweet(self, post_url: str, post_title: str, tweet_text: str, 
-                  tweet_id: Optional[str], style_params: Dict, 
+    def log_tweet(self, post_url: str, post_title: str, tweet_text: str,
+                  tweet_id: Optional[str], style_params: Dict,
                   success: bool = True, error_message: Optional[str] = None):
-        """Log a tweet attempt to the database"""
-        now = datetime.now()
+        """Queue a tweet attempt to be logged to the database"""
+        self.log_tweets_bulk([{
+            'post_url': post_url,
+            'post_title': post_title,
+            'tweet_text': tweet_text,
+            'tweet_id': tweet_id,
+            'style_params': style_params,
+            'success': success,
+            'error_message': error_message
+        }])
+    
+    @staticmethod
+    def _encode_style(style_params: Dict):
+        """Store a style as its integer code, or as JSON if it falls outside STYLE_SCHEMA"""
+        code = encode_style(style_params)
+        return code if code is not None else json.dumps(style_params, separators=_JSON_SEPARATORS)
+    
+    def log_tweets_bulk(self, entries: List[Dict]):
+        """Queue several tweet attempts to be logged (entries take log_tweet's arguments)"""
+        now = int(time.time())
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Insert or update the tweeted_posts table
+        # These posts' cooldowns start now
+        self._recent_cache = None
+        
+        for entry in entries:
+            post_row = (entry['post_url'], entry['post_title'], now, now)
+            history_row = (
+                entry['post_url'],
+                entry['tweet_text'],
+                entry.get('tweet_id'),
+                now,
+                self._encode_style(entry.get('style_params', {})),
+                entry.get('success', True),
+                entry.get('error_message')
+            )
+            self._write_queue.put((post_row, history_row))
+    
+    def _write_loop(self):
+        """Writer thread: commit queued tweet logs in batches until close() sends None"""
+        try:
+            conn = self._connect()
+        except Exception as e:
+            # Keep draining the queue so flush() doesn't wait forever; every
+            # batch below then fails with this error
+            conn = None
+            connect_error = e
+        
+        try:
+            while True:
+                # Block for the next log, then take whatever else is waiting
+                batch = [self._write_queue.get()]
+                while len(batch) < WRITE_BATCH_SIZE:
+                    try:
+                        batch.append(self._write_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                rows = [item for item in batch if item is not None]
+                try:
+                    if rows:
+                        if conn is None:
+                            raise connect_error
+                        
+                        # All writes share one transaction so the batch costs a single commit
+                        with self._transaction(conn) as cursor:
+                            # Insert or update the tweeted_posts table
+                            cursor.executemany(_SQL_LOG_POST, [post_row for post_row, _ in rows])
+                            
+                            # Insert the tweet history
+                            cursor.executemany(_SQL_LOG_HISTORY, [history_row for _, history_row in rows])
+                except Exception as e:
+                    logger.error(f"Failed to log {len(rows)} tweet(s) to the cache: {e}")
+                    self._write_error = e
+                finally:
+                    for _ in batch:
+                        self._write_queue.task_done()
+                
+                if len(rows) < len(batch):
+                    return
+        finally:
+            if conn is not None:
+                conn.close()
+    
+    @contextmanager
+    def _sitemap_cursor(self):
+        """Cursor on the sitemap snapshot connection, used by one thread at a time"""
+        with self._sitemap_lock:
+            if self._sitemap_conn is None:
+                self._sitemap_conn = self._connect()
+            yield self._sitemap_conn.cursor()
+    
+    def get_sitemap_snapshot(self, sitemap_url: str) -> Optional[Dict]:
+        """Get the validators and posts stored from the last sitemap download"""
+        with self._sitemap_cursor() as cursor:
             cursor.execute('''
-                INSERT OR REPLACE INTO tweeted_posts 
-                (post_url, post_title, first_tweeted_at, last_tweeted_at, tweet_count)
-                VALUES (
-                    ?, ?, 
-                    COALESCE((SELECT first_tweeted_at FROM tweeted_posts WHERE post_url = ?), ?),
-                    ?,
-                    COALESCE((SELECT tweet_count FROM tweeted_posts WHERE post_url = ?) + 1, 1)
-                )
-            ''', (post_url, post_title, post_url, now, now, post_url))
+                SELECT etag, last_modified, posts, fetched_at
+                FROM sitemap_cache
+                WHERE sitemap_url = ?
+            ''', (sitemap_url,))
             
-            # Insert the tweet history
+            row = cursor.fetchone()
+        
+        if row is None:
+            return None
+        
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'posts': json.loads(zlib.decompress(row[2])),
+            'fetched_at': row[3]
+        }
+    
+    def save_sitemap_snapshot(self, sitemap_url: str, etag: Optional[str],
+                              last_modified: Optional[str], posts: List[Dict]):
+        """Store the validators and parsed posts from a sitemap download"""
+        blob = zlib.compress(json.dumps(posts, separators=_JSON_SEPARATORS).encode('utf-8'))
+        with self._sitemap_cursor() as cursor:
             cursor.execute('''
-                INSERT INTO tweet_history 
-                (post_url, tweet_text, tweet_id, tweeted_at, style_params, success, error_message)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (post_url, tweet_text, tweet_id, now, json.dumps(style_params), success, error_message))
-            
-            conn.commit()
+                INSERT OR REPLACE INTO sitemap_cache
+                (sitemap_url, etag, last_modified, posts, fetched_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (sitemap_url, etag, last_modified, blob, int(time.time())))
     
     def get_stats(self) -> Dict:
         """Get cache statistics"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Total posts tweeted
-            cursor.execute('SELECT COUNT(*) FROM tweeted_posts')
-            total_posts = cursor.fetchone()[0]
-            
-            # Total tweets sent
-            cursor.execute('SELECT COUNT(*) FROM tweet_history WHERE success = TRUE')
-            total_tweets = cursor.fetchone()[0]
-            
-            # Recent activity (last 7 days)
-            week_ago = datetime.now() - timedelta(days=7)
-            cursor.execute('SELECT COUNT(*) FROM tweet_history WHERE tweeted_at >= ? AND success = TRUE', (week_ago,))
-            recent_tweets = cursor.fetchone()[0]
-            
-            return {
-                'total_posts_tweeted': total_posts,
-                'total_tweets_sent': total_tweets,
-                'tweets_last_7_days': recent_tweets
-            }
+        self.flush()
+        cursor = self._conn.cursor()
+        
+        # Total posts tweeted and total tweets sent
+        cursor.execute("SELECT key, val FROM stats WHERE key IN ('total_posts', 'total_tweets')")
+        totals = dict(cursor)
+        total_posts = totals.get('total_posts', 0)
+        total_tweets = totals.get('total_tweets', 0)
+        
+        # Recent activity (last 7 days)
+        week_ago = int(time.time()) - 7 * SECONDS_PER_DAY
+        cursor.execute('SELECT COUNT(*) FROM tweet_history WHERE tweeted_at >= ? AND success = TRUE', (week_ago,))
+        recent_tweets = cursor.fetchone()[0]
+        
+        return {
+            'total_posts_tweeted': total_posts,
+            'total_tweets_sent': total_tweets,
+            'tweets_last_7_days': recent_tweets
+        }
     
     def cleanup_old_data(self, days_to_keep: int = 365):
         """Clean up old tweet history (keep posts table but clean history)"""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        cutoff = int(time.time()) - days_to_keep * SECONDS_PER_DAY
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM tweet_history WHERE tweeted_at < ?', (cutoff_date,))
-            deleted = cursor.rowcount
-            conn.commit()
-            
-            return deleted 
\ No newline at end of file
+        self.flush()
+        cursor = self._conn.cursor()
+        cursor.execute('DELETE FROM tweet_history WHERE tweeted_at < ?', (cutoff,))
+        deleted = cursor.rowcount
+        
+        # Return the freed pages to the filesystem. executescript steps the
+        # pragma to completion; execute() would free a single page.
+        self._conn.executescript('PRAGMA incremental_vacuum;')
+        
+        return deleted
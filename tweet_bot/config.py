@@ -3,12 +3,64 @@ Configuration management for tweet-my-blog
 """
 
 import os
+import json
+import random
 from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
 
 # Load environment variables
 load_dotenv()
 
+# Style parameters and their options. Stored tweets record each option by its
+# position in these tuples, so add new options at the end of a tuple.
+STYLE_SCHEMA = (
+    ('emoji_style', ('none', 'minimal_1', 'moderate_2-3', 'enthusiastic_3+')),
+    ('tone', ('professional', 'casual', 'enthusiastic', 'conversational')),
+    ('cta_style', ('direct', 'question', 'intrigue', 'benefit-focused')),
+    ('length_target', ('concise_180', 'medium_220', 'full_280')),
+    ('include_hashtags', (True, False))
+)
+
+# Bits reserved for each parameter's option index
+_STYLE_FIELD_BITS = tuple(max(1, (len(options) - 1).bit_length()) for _, options in STYLE_SCHEMA)
+
+def encode_style(style_params: Dict[str, Any]) -> Optional[int]:
+    """Pack a style dict into an integer, or None if it has anything outside STYLE_SCHEMA"""
+    if len(style_params) != len(STYLE_SCHEMA):
+        return None
+    
+    code = 0
+    shift = 0
+    for (param, options), bits in zip(STYLE_SCHEMA, _STYLE_FIELD_BITS):
+        value = style_params.get(param)
+        # Compare types too so True doesn't match an option of 1
+        index = next((i for i, option in enumerate(options)
+                      if option == value and type(option) is type(value)), None)
+        if index is None:
+            return None
+        code |= index << shift
+        shift += bits
+    
+    return code
+
+def decode_style(stored: Union[int, str, None]) -> Dict[str, Any]:
+    """Unpack a stored style, accepting integer codes (also as digit strings) and legacy JSON"""
+    if stored is None or stored == '':
+        return {}
+    
+    if isinstance(stored, str):
+        if not stored.isdigit():
+            return json.loads(stored)
+        stored = int(stored)
+    
+    style = {}
+    for (param, options), bits in zip(STYLE_SCHEMA, _STYLE_FIELD_BITS):
+        index = stored & ((1 << bits) - 1)
+        style[param] = options[index] if index < len(options) else None
+        stored >>= bits
+    
+    return style
+
 class Config:
     """Configuration class with environment variable handling"""
     
@@ -39,15 +91,30 @@ class Config:
         # AI Model configuration
         # Options: gpt-4.1-mini (recommended), gpt-4.1-nano (ultra-cheap), gpt-4o-mini (older)
         self.openai_model = os.getenv('OPENAI_MODEL', 'gpt-4.1-mini')
+        # Optional - only used if a request to the primary model fails
+        self.openai_fallback_model = os.getenv('OPENAI_FALLBACK_MODEL')
+        
+        # Per-request OpenAI timeout in seconds (the SDK default is 10 minutes)
+        self.openai_timeout = float(os.getenv('OPENAI_TIMEOUT', '60'))
+        
+        # OpenAI per-minute request/token budgets to pace calls against (0 = no limit)
+        self.openai_rpm_limit = int(os.getenv('OPENAI_RPM_LIMIT', '500'))
+        self.openai_tpm_limit = int(os.getenv('OPENAI_TPM_LIMIT', '200000'))
+        
+        # Write tweets in the plain direct style (no emojis or hashtags, concise)
+        # from a template instead of calling OpenAI
+        self.template_fast_path = os.getenv('TEMPLATE_FAST_PATH', 'false').lower() in ('1', 'true', 'yes', 'on')
         
-        # Style variations
-        self.style_variations = {
-            'emoji_style': ['none', 'minimal_1', 'moderate_2-3', 'enthusiastic_3+'],
-            'tone': ['professional', 'casual', 'enthusiastic', 'conversational'],
-            'cta_style': ['direct', 'question', 'intrigue', 'benefit-focused'],
-            'length_target': ['concise_180', 'medium_220', 'full_280'],
-            'include_hashtags': [True, False]
-        }
+        # Retries for transient OpenAI/Twitter failures (exponential backoff)
+        self.max_api_retries = int(os.getenv('MAX_API_RETRIES', '3'))
+        
+        # Style variations (see STYLE_SCHEMA)
+        self.style_variations = {param: list(options) for param, options in STYLE_SCHEMA}
+        
+        # Frozen (param, options) pairs for get_random_style to iterate
+        self._style_items = tuple(
+            (param, tuple(options)) for param, options in self.style_variations.items()
+        )
         
     def validate_required(self, test_mode: bool = False) -> None:
         """Validate that required configuration is present"""
@@ -71,9 +138,5 @@ class Config:
             
     def get_random_style(self) -> Dict[str, Any]:
         """Get a random combination of style parameters"""
-        import random
-        
-        return {
-            param: random.choice(options) 
-            for param, options in self.style_variations.items()
-        } 
\ No newline at end of file
+        choice = random.choice
+        return {param: choice(options) for param, options in self._style_items} 
\ No newline at end of file
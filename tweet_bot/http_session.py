@@ -0,0 +1,32 @@
+"""
+Shared HTTP session for tweet-my-blog
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import __version__
+
+def _build_session() -> requests.Session:
+    """Create a pooled session that retries transient GET failures"""
+    session = requests.Session()
+    session.headers['User-Agent'] = f'tweet-my-blog/{__version__}'
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD'})
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# One session for the whole process so keep-alive connections are reused
+# across the sitemap download, post scraping, image downloads and the
+# ntfy.sh notifications
+SESSION = _build_session()
\ No newline at end of file
@@ -2,30 +2,42 @@
 Main orchestrator for tweet-my-blog
 """
 
+import atexit
 import logging
+import queue
 import random
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 from .config import Config
 from .cache_manager import CacheManager
-from .sitemap_parser import SitemapParser
-from .tweet_generator import TweetGenerator
 from .daily_scheduler import DailyScheduler
 from .random_delay import apply_random_delay
-from .notifier import Notifier
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('tweet_generator.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+def _configure_logging(log_to_file: bool):
+    """Log to the console, plus tweet_generator.log for workflow runs"""
+    handlers = [logging.StreamHandler()]
+    
+    if log_to_file:
+        # The file is written by a listener thread so the workflow never
+        # waits on disk, and only created once something is logged. Records
+        # arrive already formatted by the QueueHandler.
+        file_handler = logging.FileHandler('tweet_generator.log', delay=True)
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        handlers.append(QueueHandler(log_queue))
+    
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, handlers=handlers)
+
 class TweetBot:
     """Main tweet bot orchestrator"""
     
@@ -37,13 +49,18 @@ class TweetBot:
         try:
             self.config.validate_required(test_mode)
         except ValueError as e:
-            logger.error(f"Configuration error: {e}")
+            logger.error("Configuration error: %s", e)
             sys.exit(1)
         
-        # Initialize components
+        # Imported here rather than at module level: requests is slow to
+        # import and most scheduled runs exit on the schedule check before a
+        # TweetBot is ever created
+        from .sitemap_parser import SitemapParser
+        from .notifier import Notifier
+        
+        # Initialize components (the tweet generator is created on first use)
         self.cache = CacheManager(self.config.cache_db_path)
-        self.sitemap_parser = SitemapParser(self.config.sitemap_url)
-        self.tweet_generator = TweetGenerator(self.config, test_mode)
+        self.sitemap_parser = SitemapParser(self.config.sitemap_url, cache=self.cache)
         self.notifier = Notifier(self.config.ntfy_topic)
         
         logger.info("TweetBot initialized successfully")
@@ -52,35 +69,49 @@ class TweetBot:
         
         # Log notification status
         if self.config.ntfy_topic:
-            logger.info(f"✅ ntfy.sh notifications enabled for topic: {self.config.ntfy_topic}")
+            logger.info("✅ ntfy.sh notifications enabled for topic: %s", self.config.ntfy_topic)
         else:
             logger.info("ℹ️ ntfy.sh notifications disabled (no NTFY_TOPIC set)")
     
+    @cached_property
+    def tweet_generator(self):
+        """OpenAI/Twitter clients, only imported and built when a tweet is generated"""
+        from .tweet_generator import TweetGenerator
+        return TweetGenerator(self.config, self.test_mode)
+    
     def run(self) -> bool:
         """Run the main tweet generation workflow"""
         try:
             logger.info("Starting tweet generation workflow")
             
-            # Get cache stats
-            stats = self.cache.get_stats()
-            logger.info(f"Cache stats: {stats}")
+            # Download the sitemap in the background while the cache is queried
+            executor = ThreadPoolExecutor(max_workers=1)
+            sitemap_future = executor.submit(self.sitemap_parser.fetch_posts)
+            executor.shutdown(wait=False)
             
-            # Get recently tweeted URLs (respecting cooldown)
-            recently_tweeted = self.cache.get_recently_tweeted_urls(self.config.cooldown_days)
-            logger.info(f"Found {len(recently_tweeted)} recently tweeted URLs (cooldown: {self.config.cooldown_days} days)")
+            with self.cache.session() as cache:
+                # Get cache stats
+                stats = cache.get_stats()
+                
+                # Get recently tweeted URLs (respecting cooldown)
+                recently_tweeted = cache.get_recently_tweeted_urls(self.config.cooldown_days)
             
-            # Get eligible posts
-            eligible_posts = self.sitemap_parser.get_eligible_posts(recently_tweeted)
+            logger.info("Cache stats: %s", stats)
+            logger.info("Found %d recently tweeted URLs (cooldown: %d days)", len(recently_tweeted), self.config.cooldown_days)
             
-            if not eligible_posts:
+            # Pick a random eligible post (reusing the fetch started above)
+            selected_post, all_posts = self.sitemap_parser.pick_eligible_post(
+                recently_tweeted, sitemap_future.result()
+            )
+            
+            if selected_post is None:
                 # Check if we should exhaust content (re-tweet old posts)
                 if recently_tweeted:
                     logger.info("No new posts available, checking if we should re-tweet older content")
-                    # Get all posts and allow re-tweeting
-                    all_posts = self.sitemap_parser.fetch_posts()
+                    # Allow re-tweeting from all posts
                     if all_posts:
-                        eligible_posts = all_posts
-                        logger.info(f"Exhausted new content, allowing re-tweets from {len(eligible_posts)} total posts")
+                        logger.info("Exhausted new content, allowing re-tweets from %d total posts", len(all_posts))
+                        selected_post = random.choice(all_posts)
                     else:
                         logger.error("No posts found in sitemap")
                         return False
@@ -88,9 +119,16 @@ class TweetBot:
                     logger.error("No eligible posts found")
                     return False
             
-            # Select a random post
-            selected_post = random.choice(eligible_posts)
-            logger.info(f"Selected post: {selected_post['title']} ({selected_post['url']})")
+            logger.info("Selected post: %s (%s)", selected_post['title'], selected_post['url'])
+            
+            # Upload the featured image in the background while the post is
+            # scraped and the tweet generated; neither depends on the other
+            executor = ThreadPoolExecutor(max_workers=1)
+            media_future = executor.submit(
+                self.tweet_generator.prepare_media,
+                selected_post.get('featured_image')
+            )
+            executor.shutdown(wait=False)
             
             # Scrape the post content for better context
             post_content = self.tweet_generator.scrape_post_content(selected_post['url'])
@@ -112,11 +150,11 @@ class TweetBot:
             )
             
             if previous_tweets:
-                logger.info(f"Found {len(previous_tweets)} previous tweets for this post")
+                logger.info("Found %d previous tweets for this post", len(previous_tweets))
             
             # Generate random style parameters
             style_params = self.config.get_random_style()
-            logger.info(f"Using style parameters: {style_params}")
+            logger.info("Using style parameters: %s", style_params)
             
             # Generate the tweet
             tweet_text = self.tweet_generator.generate_tweet_text(
@@ -127,12 +165,13 @@ class TweetBot:
                 logger.error("Failed to generate tweet text")
                 return False
             
-            logger.info(f"Generated tweet ({len(tweet_text)} chars): {tweet_text}")
+            logger.info("Generated tweet (%d chars): %s", len(tweet_text), tweet_text)
             
             # Post the tweet
             tweet_id = self.tweet_generator.post_tweet(
                 tweet_text, 
-                post_data.get('featured_image')
+                post_data.get('featured_image'),
+                media_ids=media_future.result()
             )
             
             success = tweet_id is not None
@@ -148,8 +187,12 @@ class TweetBot:
                 error_message=None if success else "Failed to post tweet"
             )
             
+            # The log has to be on disk before the workflow commits cache.db,
+            # or the post never enters cooldown; a failed write raises here
+            self.cache.flush()
+            
             if success:
-                logger.info(f"✅ Successfully tweeted! Tweet ID: {tweet_id}")
+                logger.info("✅ Successfully tweeted! Tweet ID: %s", tweet_id)
                 if not self.test_mode:
                     print(f"🐦 Tweet posted: https://twitter.com/user/status/{tweet_id}")
                 print(f"📄 Post: {post_data['url']}")
@@ -174,7 +217,7 @@ class TweetBot:
             return True
             
         except Exception as e:
-            logger.error(f"Error in tweet generation workflow: {e}", exc_info=True)
+            logger.error("Error in tweet generation workflow: %s", e, exc_info=True)
             
             # Send error notification for unexpected failures
             self.notifier.send_error_notification(
@@ -208,7 +251,8 @@ def main():
         if not scheduler.should_run_today():
             schedule = scheduler.get_todays_schedule()
             if schedule:
-                print(f"⏰ Not scheduled to run now. Today's slot: {schedule['hour']:02d}:{schedule['minute']:02d} UTC")
+                print(f"⏰ Not scheduled to run now. Today's slot: {schedule['hour']:02d}:{schedule['minute']:02d} UTC"
+                      f" (+{schedule['delay_seconds']}s delay)")
             else:
                 print("⏰ No schedule found for today")
             sys.exit(0)
@@ -220,6 +264,9 @@ def main():
         else:
             print("⏰ Test mode: skipping random delay")
     
+    # --stats and --cleanup only need the console
+    _configure_logging(log_to_file=not (args.stats or args.cleanup))
+    
     bot = TweetBot(test_mode=args.test)
     
     if args.stats:
@@ -3,9 +3,10 @@ Notification system for tweet-my-blog
 """
 
 import logging
-import requests
 from typing import Optional
 
+from .http_session import SESSION
+
 logger = logging.getLogger(__name__)
 
 class Notifier:
@@ -19,79 +20,41 @@ class Notifier:
         if not self.ntfy_topic:
             logger.debug("No ntfy.sh topic configured, skipping notification")
             return True  # Return True since this is expected behavior
-            
-        try:
-            # Construct the notification message
-            title = "Tweet Posted!"
-            
-            message_parts = [
-                f"🐦 Tweet Posted!",
-                "",
-                f"📝 {tweet_text}",
-                "",
-                f"📄 Post: {post_url}"
-            ]
-            
-            if tweet_id:
-                message_parts.append(f"🔗 Tweet: https://twitter.com/user/status/{tweet_id}")
-            
-            message = "\n".join(message_parts)
-            
-            # Send notification to ntfy.sh
-            response = requests.post(
-                f"https://ntfy.sh/{self.ntfy_topic}",
-                headers={
-                    "Title": title,
-                    "Tags": "bird,blog,automation"
-                },
-                data=message.encode('utf-8'),
-                timeout=10
-            )
-            
-            response.raise_for_status()
-            logger.info(f"✅ Notification sent to ntfy.sh topic: {self.ntfy_topic}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to send ntfy.sh notification: {e}")
-            return False
+        
+        tweet_link = f"\n🔗 Tweet: https://twitter.com/user/status/{tweet_id}" if tweet_id else ""
+        message = f"🐦 Tweet Posted!\n\n📝 {tweet_text}\n\n📄 Post: {post_url}{tweet_link}"
+        return self._send("Tweet Posted!", "bird,blog,automation", message, kind="notification")
     
     def send_error_notification(self, error_message: str, post_url: Optional[str] = None) -> bool:
         """Send a notification when tweet generation fails"""
         if not self.ntfy_topic:
             logger.debug("No ntfy.sh topic configured, skipping error notification")
             return True
-            
+        
+        post_line = f"\n📄 Post: {post_url}" if post_url else ""
+        message = f"⚠️ Tweet Generation Failed\n\n❌ {error_message}{post_line}"
+        return self._send("Tweet Generation Failed", "warning,blog,automation", message,
+                          priority="high", kind="error notification")
+    
+    def _send(self, title: str, tags: str, body: str, priority: Optional[str] = None,
+              kind: str = "notification") -> bool:
+        """Post a message to the ntfy.sh topic"""
+        headers = {"Title": title, "Tags": tags}
+        if priority:
+            headers["Priority"] = priority
+        
         try:
-            title = "Tweet Generation Failed"
-            
-            message_parts = [
-                f"⚠️ Tweet Generation Failed",
-                "",
-                f"❌ {error_message}"
-            ]
-            
-            if post_url:
-                message_parts.append(f"📄 Post: {post_url}")
-            
-            message = "\n".join(message_parts)
-            
-            # Send notification to ntfy.sh
-            response = requests.post(
+            response = SESSION.post(
                 f"https://ntfy.sh/{self.ntfy_topic}",
-                headers={
-                    "Title": title,
-                    "Tags": "warning,blog,automation",
-                    "Priority": "high"
-                },
-                data=message.encode('utf-8'),
+                headers=headers,
+                data=body.encode('utf-8'),
                 timeout=10
             )
             
             response.raise_for_status()
-            logger.info(f"✅ Error notification sent to ntfy.sh topic: {self.ntfy_topic}")
+            logger.info(f"✅ {kind.capitalize()} sent to ntfy.sh topic: {self.ntfy_topic}")
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to send ntfy.sh error notification: {e}")
-            return False 
\ No newline at end of file
+            logger.error(f"❌ Failed to send ntfy.sh {kind}: {e}")
+            return False
\ No newline at end of file
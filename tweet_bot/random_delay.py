@@ -2,14 +2,35 @@
 Random delay module for human-like variability
 """
 
+import hashlib
 import os
-import random
 import time
+from datetime import datetime, timezone
+
+MAX_DELAY = 180
+
+# Read once at import; tweet_bot.main imports config (which loads .env) first.
+# Tests should patch this rather than the environment variable.
+_ENABLED = os.getenv("ENABLE_DELAY", "false").strip().lower() in ('1', 'true', 'yes', 'on')
+
+def _delay_seconds() -> int:
+    """
+    Delay for this blog today: stable for a sitemap on a given date (so a
+    skipped run can report it, even from another machine), but different
+    between bots for different blogs so they don't fire together
+    """
+    key = f"{os.getenv('SITEMAP_URL', '')}|{datetime.now(timezone.utc):%Y-%m-%d}"
+    digest = hashlib.blake2s(key.encode(), digest_size=4).digest()
+    return int.from_bytes(digest, 'big') % (MAX_DELAY + 1)
+
+def planned_delay() -> int:
+    """Seconds apply_random_delay will wait today (0 when disabled)"""
+    return _delay_seconds() if _ENABLED else 0
 
 def apply_random_delay():
     """Apply a random delay if enabled via environment variable"""
-    if os.getenv("ENABLE_DELAY", "false").lower() == "true":
-        delay = random.randint(0, 180)
+    if _ENABLED:
+        delay = _delay_seconds()
         print(f"Delaying execution by {delay} seconds for human-like variability...")
         time.sleep(delay)
     else:
@@ -17,4 +38,4 @@ def apply_random_delay():
 
 if __name__ == "__main__":
     # Allow running this module directly for testing
-    apply_random_delay() 
\ No newline at end of file
+    apply_random_delay()
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Sliding-window request/token throttling for OpenAI calls
+"""
+
+import threading
+import time
+from collections import deque
+from typing import List
+
+class RateLimiter:
+    """Blocks before a call would exceed the requests- or tokens-per-minute budget"""
+
+    def __init__(self, rpm_limit: int, tpm_limit: int, window: float = 60.0):
+        self.rpm_limit = rpm_limit  # 0 disables the request limit
+        self.tpm_limit = tpm_limit  # 0 disables the token limit
+        self.window = window
+        self._calls = deque()  # timestamps of recent calls
+        self._tokens = deque()  # [timestamp, tokens] of recent calls, reserved up front
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        """Drop entries that have left the window"""
+        cutoff = now - self.window
+        while self._calls and self._calls[0] <= cutoff:
+            self._calls.popleft()
+        while self._tokens and self._tokens[0][0] <= cutoff:
+            self._tokens.popleft()
+
+    def time_until_available(self, expected_tokens: int = 0) -> float:
+        """Seconds to wait before a call using expected_tokens fits in the budget"""
+        with self._lock:
+            return self._delay(expected_tokens, time.monotonic())
+
+    def _delay(self, expected_tokens: int, now: float) -> float:
+        self._expire(now)
+        delay = 0.0
+
+        if self.rpm_limit and len(self._calls) >= self.rpm_limit:
+            delay = self._calls[0] + self.window - now
+
+        if self.tpm_limit and self._tokens:
+            used = sum(tokens for _, tokens in self._tokens)
+            if used + expected_tokens > self.tpm_limit:
+                delay = max(delay, self._tokens[0][0] + self.window - now)
+
+        return delay
+
+    def acquire(self, expected_tokens: int = 0) -> List:
+        """
+        Wait until the call fits in the budget, then count it and reserve
+        expected_tokens so concurrent callers can't all pass the same check.
+        Returns the reservation to hand to record_tokens.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._delay(expected_tokens, now)
+                if delay <= 0:
+                    self._calls.append(now)
+                    reservation = [now, expected_tokens]
+                    self._tokens.append(reservation)
+                    return reservation
+            time.sleep(delay)
+
+    def record_tokens(self, reservation: List, tokens: int) -> None:
+        """Replace a call's reserved estimate with the tokens it actually used"""
+        with self._lock:
+            reservation[1] = tokens
@@ -0,0 +1,32 @@
+"""
+Retry helper with exponential backoff for transient API failures
+"""
+
+import logging
+import random
+import time
+from typing import Callable, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+def retry_with_backoff(func: Callable[[], T], retry_on: Tuple[Type[BaseException], ...],
+                       max_attempts: int = 4, base_delay: float = 2.0,
+                       max_delay: float = 60.0,
+                       retry_if: Optional[Callable[[BaseException], bool]] = None) -> T:
+    """
+    Call func, retrying errors in retry_on with exponential backoff and jitter.
+    If retry_if is given, only errors it returns True for are retried.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return func()
+        except retry_on as e:
+            if attempt >= max_attempts or (retry_if is not None and not retry_if(e)):
+                raise
+
+            # 2s, 4s, 8s... capped, plus jitter so parallel runs don't retry in lockstep
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1)) + random.uniform(0, 1)
+            logger.warning(f"Attempt {attempt}/{max_attempts} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
@@ -2,28 +2,84 @@
 WordPress sitemap parser for extracting blog post information
 """
 
+import random
+import re
 import requests
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional, Tuple
 from urllib.parse import urlparse
 import logging
 
+from .http_session import SESSION
+
 logger = logging.getLogger(__name__)
 
+# WordPress sitemap namespaces
+_NAMESPACES = {
+    'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9',
+    'image': 'http://www.google.com/schemas/sitemap-image/1.1'
+}
+
+# Clark-notation tags: matched directly, without ElementPath resolving a
+# prefix against the namespace map on every lookup
+_URL_TAG = f"{{{_NAMESPACES['sitemap']}}}url"
+_LOC_TAG = f"{{{_NAMESPACES['sitemap']}}}loc"
+_LASTMOD_TAG = f"{{{_NAMESPACES['sitemap']}}}lastmod"
+_IMAGE_TAG = f"{{{_NAMESPACES['image']}}}image"
+_IMAGE_LOC_TAG = f"{{{_NAMESPACES['image']}}}loc"
+
+# Path fragments of non-post WordPress pages
+_EXCLUDED_PATH = re.compile(r'/(?:wp-|feed|sitemap|category/|tag/|author/|search/|page/|privacy|terms)')
+
+# Slug word separators, mapped to spaces in a single translate
+_SLUG_SEPARATORS = str.maketrans('-_', '  ')
+
+def _normalize_url(url: str) -> str:
+    """Key for comparing post URLs regardless of trailing slash or casing"""
+    return url.rstrip('/').lower()
+
 class SitemapParser:
     """Parses WordPress post sitemaps and extracts post information"""
     
-    def __init__(self, sitemap_url: str):
+    def __init__(self, sitemap_url: str, cache=None):
         self.sitemap_url = sitemap_url
+        self.cache = cache  # Optional CacheManager holding the last download for conditional GETs
     
     def fetch_posts(self) -> List[Dict]:
-        """Fetch and parse all posts from the sitemap"""
+        """Fetch and parse all posts from the sitemap, revalidating the stored copy if there is one"""
         try:
+            snapshot = self.cache.get_sitemap_snapshot(self.sitemap_url) if self.cache else None
+            
+            headers = {}
+            if snapshot:
+                if snapshot['etag']:
+                    headers['If-None-Match'] = snapshot['etag']
+                if snapshot['last_modified']:
+                    headers['If-Modified-Since'] = snapshot['last_modified']
+            
             logger.info(f"Fetching sitemap from {self.sitemap_url}")
-            response = requests.get(self.sitemap_url, timeout=30)
-            response.raise_for_status()
+            # Streamed so parsing starts as the first bytes arrive and the
+            # whole body is never buffered
+            with SESSION.get(self.sitemap_url, headers=headers, timeout=30, stream=True) as response:
+                if response.status_code == 304 and snapshot:
+                    logger.info(f"Sitemap not modified, using {len(snapshot['posts'])} stored posts")
+                    return snapshot['posts']
+                
+                response.raise_for_status()
+                logger.debug(f"Sitemap Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}")
+                
+                # Let urllib3 undo any gzip/deflate/br/zstd content encoding
+                # as the parser reads
+                response.raw.decode_content = True
+                posts = self._parse_sitemap_stream(response.raw)
+            
+            # Store the result if the server gave us something to revalidate with
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if posts and self.cache and (etag or last_modified):
+                self.cache.save_sitemap_snapshot(self.sitemap_url, etag, last_modified, posts)
             
-            return self._parse_sitemap_xml(response.content)
+            return posts
             
         except requests.RequestException as e:
             logger.error(f"Failed to fetch sitemap: {e}")
@@ -32,23 +88,24 @@ class SitemapParser:
             logger.error(f"Failed to parse sitemap XML: {e}")
             return []
     
-    def _parse_sitemap_xml(self, xml_content: bytes) -> List[Dict]:
-        """Parse the XML sitemap content"""
+    def _parse_sitemap_stream(self, stream: BinaryIO) -> List[Dict]:
+        """Parse the XML sitemap from a file-like object one <url> element at a time"""
         try:
-            root = ET.fromstring(xml_content)
-            
-            # Handle WordPress sitemap namespace
-            namespaces = {
-                'sitemap': 'http://www.sitemaps.org/schemas/sitemap/0.9',
-                'image': 'http://www.google.com/schemas/sitemap-image/1.1'
-            }
-            
             posts = []
-            
-            for url_elem in root.findall('sitemap:url', namespaces):
-                post_data = self._extract_post_data(url_elem, namespaces)
+            root = None
+            
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                if event != 'end' or elem.tag != _URL_TAG:
+                    continue
+                
+                post_data = self._extract_post_data(elem)
                 if post_data:
                     posts.append(post_data)
+                
+                # Drop the processed <url> elements so the tree never grows
+                root.clear()
             
             logger.info(f"Parsed {len(posts)} posts from sitemap")
             return posts
@@ -57,35 +114,40 @@ class SitemapParser:
             logger.error(f"Error parsing sitemap XML: {e}")
             return []
     
-    def _extract_post_data(self, url_elem, namespaces: Dict) -> Optional[Dict]:
+    def _extract_post_data(self, url_elem) -> Optional[Dict]:
         """Extract post data from a URL element"""
         try:
             # Get basic URL info
-            loc_elem = url_elem.find('sitemap:loc', namespaces)
+            loc_elem = url_elem.find(_LOC_TAG)
             if loc_elem is None:
                 return None
             
             url = loc_elem.text.strip()
             
-            # Skip if not a blog post URL (customize this for your site structure)
-            if not self._is_blog_post_url(url):
+            # Parsed once here and shared by the helpers below
+            path = urlparse(url).path.lower()
+            stripped_path = path.strip('/')
+            
+            # Skip if not a blog post URL (customize this for your site structure).
+            # Must have content (not just domain).
+            if not stripped_path or not self._is_blog_post_url(path):
                 return None
             
             # Get last modified date
-            lastmod_elem = url_elem.find('sitemap:lastmod', namespaces)
+            lastmod_elem = url_elem.find(_LASTMOD_TAG)
             lastmod = lastmod_elem.text if lastmod_elem is not None else None
             
             # Get featured image (WordPress includes these in image:image tags)
-            image_elem = url_elem.find('image:image', namespaces)
+            image_elem = url_elem.find(_IMAGE_TAG)
             featured_image = None
             
             if image_elem is not None:
-                image_loc = image_elem.find('image:loc', namespaces)
+                image_loc = image_elem.find(_IMAGE_LOC_TAG)
                 if image_loc is not None:
                     featured_image = image_loc.text.strip()
             
             # Extract title from URL (we'll get the real title when we scrape)
-            title = self._extract_title_from_url(url)
+            title = self._extract_title_from_url(stripped_path)
             
             return {
                 'url': url,
@@ -98,37 +160,14 @@ class SitemapParser:
             logger.error(f"Error extracting post data: {e}")
             return None
     
-    def _is_blog_post_url(self, url: str) -> bool:
-        """Determine if URL is a blog post (customize for your site)"""
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        
+    def _is_blog_post_url(self, path: str) -> bool:
+        """Determine if a lowercased URL path is a blog post (customize for your site)"""
         # For pikeandvine.com, blog posts are typically /post-slug/
-        # Exclude main blog page and other non-post pages
-        if path in ['/', '/blog/', '/blog']:
-            return False
-        
-        # Exclude common WordPress pages
-        excluded_patterns = [
-            '/wp-', '/feed', '/sitemap', '/category/', '/tag/', 
-            '/author/', '/search/', '/page/', '/privacy', '/terms'
-        ]
-        
-        for pattern in excluded_patterns:
-            if pattern in path:
-                return False
-        
-        # Must have content (not just domain)
-        if len(path.strip('/')) == 0:
-            return False
-            
-        return True
+        # Exclude main blog page, other non-post pages and common WordPress pages
+        return path not in ('/blog/', '/blog') and not _EXCLUDED_PATH.search(path)
     
-    def _extract_title_from_url(self, url: str) -> str:
-        """Extract a basic title from the URL slug"""
-        parsed = urlparse(url)
-        path = parsed.path.strip('/')
-        
+    def _extract_title_from_url(self, path: str) -> str:
+        """Extract a basic title from the URL slug, given the path without surrounding slashes"""
         if '/' in path:
             # Take the last part if there are multiple segments
             slug = path.split('/')[-1]
@@ -136,17 +175,34 @@ class SitemapParser:
             slug = path
         
         # Convert slug to title-case
-        title = slug.replace('-', ' ').replace('_', ' ').title()
-        return title
+        return slug.translate(_SLUG_SEPARATORS).title()
     
-    def get_eligible_posts(self, excluded_urls: set) -> List[Dict]:
-        """Get posts that are eligible for tweeting (not in excluded set)"""
-        all_posts = self.fetch_posts()
+    def pick_eligible_post(self, excluded_urls: set,
+                           all_posts: Optional[List[Dict]] = None) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Pick a random post eligible for tweeting (not in excluded set) in one pass,
+        without building a list of the eligible posts. Picks from all_posts if
+        given (e.g. an earlier fetch_posts result), otherwise fetches them.
+        Returns the pick (None if nothing is eligible) and all posts.
+        """
+        if all_posts is None:
+            all_posts = self.fetch_posts()
+        
+        # Compare normalized URLs so a trailing slash or casing difference
+        # doesn't make a recently tweeted post look new
+        excluded = frozenset(_normalize_url(url) for url in excluded_urls)
         
-        eligible = [
-            post for post in all_posts 
-            if post['url'] not in excluded_urls
-        ]
+        # Reservoir sampling: the nth eligible post replaces the pick with
+        # probability 1/n, so every eligible post is equally likely
+        chosen = None
+        count = 0
+        rand = random.random
+        for post in all_posts:
+            if _normalize_url(post['url']) in excluded:
+                continue
+            count += 1
+            if rand() * count < 1:
+                chosen = post
         
-        logger.info(f"Found {len(eligible)} eligible posts out of {len(all_posts)} total")
-        return eligible 
\ No newline at end of file
+        logger.info(f"Found {count} eligible posts out of {len(all_posts)} total")
+        return chosen, all_posts 
\ No newline at end of file
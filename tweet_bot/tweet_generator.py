@@ -6,86 +6,314 @@ import logging
 import random
 import requests
 from typing import Dict, List, Optional, Tuple
-from openai import OpenAI
 import tweepy
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import re
+import shutil
+import threading
+from functools import cached_property
 from io import BytesIO
+from urllib3.exceptions import ConnectTimeoutError
+
+from .http_session import SESSION
+from .rate_limiter import RateLimiter
+from .retry import retry_with_backoff
 
 logger = logging.getLogger(__name__)
 
+# Completion cap: a full 280-character tweet with emojis, hashtags and the URL
+# runs to ~90 tokens, and SYSTEM_PROMPT asks for line breaks, so there is no
+# blank-line stop sequence either
+MAX_COMPLETION_TOKENS = 100
+
+# Persona and writing rules sent as the system message, with only the blog
+# context filled in; the per-post details go in the user message. (At ~350
+# tokens it is below the 1024-token minimum for OpenAI's prompt caching.)
+SYSTEM_PROMPT = """You are a social media expert who writes engaging tweets to promote blog posts. You write in a natural, human voice that doesn't sound like AI-generated content.
+
+Requirements:
+- Must include the post's URL exactly as given
+- Maximum 280 characters total
+- Natural, human voice (not AI-sounding)
+- Engaging and clickable
+- DO NOT refer to the post as 'latest', 'new', or 'just published' unless it's from the last 7 days
+- Focus on the content value rather than recency
+- Blog context: {blog_title} - {blog_description}
+
+CRITICAL WRITING RULES:
+- COMPLETE ALL SENTENCES - never end with incomplete phrases like 'not', 'and', 'or', 'but'
+- Every sentence must be grammatically complete and make sense on its own
+- If approaching character limit, end with a complete sentence rather than an incomplete one
+- Proofread the final tweet to ensure no dangling words or incomplete thoughts
+
+FORMATTING RULES:
+- Use at least 2 line breaks to improve readability
+- Avoid dense blocks of text - break content into digestible sections
+- Format for easy scanning and readability
+
+GRAMMAR RULES:
+- NO Oxford commas (do not use comma before 'and' in lists)
+- NO em dashes (—) - use regular hyphens (-) or avoid dashes entirely"""
+
+# BeautifulSoup backend: lxml's C parser when installed (see requirements.txt),
+# otherwise the pure-Python one from the stdlib
+try:
+    import lxml
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# API clients (and the OpenAI rate limiter) shared by every TweetGenerator
+# built with the same settings, so their connection pools (and warm TLS
+# connections) and the account's rate-limit windows outlive any one generator
+_SHARED_CLIENTS: Dict[Tuple, object] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+def _shared_client(key: Tuple, build):
+    """The client stored under key, built with build() the first time"""
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(key)
+        if client is None:
+            client = _SHARED_CLIENTS[key] = build()
+        return client
+
+# Post pages are fetched as a browser would; some hosts turn away bot agents
+_SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Where scrape_post_content looks for the title and excerpt, in priority
+# order. Compiled once rather than parsed again by every select_one call.
+_TITLE_SELECTORS = tuple(soupsieve.compile(selector) for selector in (
+    'h1.entry-title', 'h1.post-title', 'h1', 'title'
+))
+_EXCERPT_SELECTORS = tuple(soupsieve.compile(selector) for selector in (
+    '.entry-excerpt', '.post-excerpt', '.excerpt',
+    '.entry-content p', '.post-content p', '.content p'
+))
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Containers the excerpt selectors look inside
+_EXCERPT_CLASSES = frozenset({
+    'entry-excerpt', 'post-excerpt', 'excerpt',
+    'entry-content', 'post-content', 'content'
+})
+
+def _has_excerpt_class(value) -> bool:
+    """Whether a raw class attribute names one of the excerpt containers"""
+    if not value:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return not _EXCERPT_CLASSES.isdisjoint(classes)
+
+# Only what scrape_post_content reads is built into a tree: one pass keeps
+# the title candidates and meta tags, another the excerpt containers with
+# their contents. SoupStrainer can't OR a tag-name rule with a class rule.
+_HEAD_STRAINER = SoupStrainer(['h1', 'title', 'meta'])
+_EXCERPT_STRAINER = SoupStrainer(class_=_has_excerpt_class)
+
+# Twitter's weighted length limit. Links count as a t.co URL whatever their
+# length; CJK, emoji and other characters outside the Latin-and-punctuation
+# ranges count double.
+MAX_TWEET_WEIGHT = 280
+_URL_WEIGHT = 23
+_URL_RE = re.compile(r'https?://\S+?(?=[.,:;!?)\]\'"]*(?:\s|$))')
+
+def _char_weight(char: str) -> int:
+    """Weight of a single character in Twitter's length count"""
+    code = ord(char)
+    if code <= 4351 or 8192 <= code <= 8205 or 8208 <= code <= 8223 or 8242 <= code <= 8247:
+        return 1
+    return 2
+
+def _weighted_length(text: str) -> int:
+    """Tweet length as Twitter counts it (emoji sequences are overcounted, never under)"""
+    length = 0
+    pos = 0
+    for match in _URL_RE.finditer(text):
+        length += sum(map(_char_weight, text[pos:match.start()])) + _URL_WEIGHT
+        pos = match.end()
+    return length + sum(map(_char_weight, text[pos:]))
+
+def _weighted_prefix(text: str, budget: int) -> int:
+    """Number of leading characters of text that fit in a weighted budget"""
+    used = 0
+    for i, char in enumerate(text):
+        used += _char_weight(char)
+        if used > budget:
+            return i
+    return len(text)
+
+def _word_trim(text: str, limit: int) -> str:
+    """Cut text at the last space before limit (at limit if there is none)"""
+    cut = text.rfind(' ', 0, limit)
+    return text[:cut] if cut >= 0 else text[:limit]
+
+# Common endings that indicate the model stopped mid-sentence, compiled once
+INCOMPLETE_ENDING_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(not|and|or|but|so|yet|for|nor|with|to|from|in|on|at|by|of)\s*$',  # ends with preposition/conjunction
+    r'\b(smarter|better|faster|more|less|rather|quite|very|really|just)\s*$',  # ends with adverb/modifier
+    r'\b(the|a|an|this|that|these|those|my|your|our|their)\s*$',  # ends with article/determiner
+))
+
 class TweetGenerator:
     """Generates and posts tweets using OpenAI and Twitter API"""
     
+    @staticmethod
+    def _never_sent(error: BaseException) -> bool:
+        """
+        Whether a requests error happened before the request reached Twitter
+        (refused or timed-out connection, failed DNS lookup). Only these are
+        safe to retry for create_tweet, which would otherwise post twice.
+        """
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(error, requests.ConnectTimeout) or isinstance(reason, ConnectTimeoutError)
+    
+    @staticmethod
+    def _is_transient_upload_error(error: BaseException) -> bool:
+        """
+        Whether a media upload failed on a server error or dropped connection.
+        tweepy.API wraps requests' exceptions in a plain TweepyException.
+        """
+        return (isinstance(error, tweepy.TwitterServerError)
+                or isinstance(error.__context__, (requests.ConnectionError, requests.Timeout)))
+    
+    # Plain style that TEMPLATE_FAST_PATH writes from a template instead of OpenAI
+    _TEMPLATE_STYLE = {
+        'emoji_style': 'none',
+        'cta_style': 'direct',
+        'length_target': 'concise_180',
+        'include_hashtags': False
+    }
+    
+    # Prompt instructions for each style option (see config.STYLE_SCHEMA)
+    _EMOJI_INSTRUCTIONS = {
+        'none': "- Use no emojis",
+        'minimal_1': "- Use exactly 1 emoji, placed naturally",
+        'moderate_2-3': "- Use 2-3 emojis maximum, placed naturally",
+        'enthusiastic_3+': "- Use 3+ emojis to show enthusiasm"
+    }
+    _TONE_INSTRUCTIONS = {
+        'professional': "- Professional, authoritative tone",
+        'casual': "- Casual, friendly tone",
+        'enthusiastic': "- Enthusiastic, energetic tone",
+        'conversational': "- Conversational, approachable tone"
+    }
+    _CTA_INSTRUCTIONS = {
+        'direct': "- Direct call-to-action (e.g., 'Read more:', 'Check it out:')",
+        'question': "- Use a question to create curiosity",
+        'intrigue': "- Create intrigue without giving everything away",
+        'benefit-focused': "- Focus on the benefit/value to the reader"
+    }
+    _LENGTH_INSTRUCTIONS = {
+        'concise_180': "- Keep it concise, under 180 characters",
+        'medium_220': "- Aim for around 220 characters",
+        'full_280': "- Use the full 280 character limit if needed"
+    }
+    
     def __init__(self, config, test_mode: bool = False):
         self.config = config
         self.test_mode = test_mode
         
-        # Initialize OpenAI client
-        self.openai_client = OpenAI(api_key=config.openai_api_key)
+        # Pace OpenAI calls against the account's per-minute limits up front
+        # rather than waiting to be told off with a 429. Shared like the
+        # client, since the limits are per account rather than per generator
+        self.rate_limiter = _shared_client(
+            ('openai-limits', config.openai_api_key, config.openai_rpm_limit, config.openai_tpm_limit),
+            lambda: RateLimiter(config.openai_rpm_limit, config.openai_tpm_limit)
+        )
+        
+        self.system_prompt = SYSTEM_PROMPT.format(
+            blog_title=config.blog_title,
+            blog_description=config.blog_description
+        )
+        # Shared by every request's messages list
+        self._system_message = {"role": "system", "content": self.system_prompt}
         
-        # Initialize Twitter client (only if not in test mode)
+        # Initialize the v2 Twitter client for posting (only if not in test
+        # mode; the v1.1 API for media uploads is built on first upload)
         if not test_mode:
-            auth = tweepy.OAuthHandler(
+            credentials = (
                 config.twitter_api_key,
-                config.twitter_api_secret
-            )
-            auth.set_access_token(
+                config.twitter_api_secret,
                 config.twitter_access_token,
                 config.twitter_access_token_secret
             )
-            self.twitter_api = tweepy.API(auth, wait_on_rate_limit=True)
-            
-            # Also initialize the v2 client for posting
-            self.twitter_client = tweepy.Client(
+            self.twitter_client = _shared_client(('twitter',) + credentials, lambda: tweepy.Client(
                 consumer_key=config.twitter_api_key,
                 consumer_secret=config.twitter_api_secret,
                 access_token=config.twitter_access_token,
                 access_token_secret=config.twitter_access_token_secret,
                 wait_on_rate_limit=True
-            )
+            ))
+    
+    @cached_property
+    def openai_client(self):
+        """
+        OpenAI client, built on first use: the SDK is the slowest import here
+        and templated or cached tweets never need it. It retries 429/5xx with
+        backoff itself; HTTP/2 with keep-alive lets retries and the fallback
+        model reuse the open connection instead of paying for a new TLS handshake.
+        """
+        from openai import OpenAI, DefaultHttpxClient
+        
+        config = self.config
+        key = ('openai', config.openai_api_key, config.max_api_retries, config.openai_timeout)
+        return _shared_client(key, lambda: OpenAI(
+            api_key=config.openai_api_key,
+            max_retries=config.max_api_retries,
+            timeout=config.openai_timeout,
+            http_client=DefaultHttpxClient(http2=True)
+        ))
+    
+    @cached_property
+    def twitter_api(self):
+        """v1.1 API handle, only needed for media uploads (v2 doesn't support them)"""
+        auth = tweepy.OAuthHandler(
+            self.config.twitter_api_key,
+            self.config.twitter_api_secret
+        )
+        auth.set_access_token(
+            self.config.twitter_access_token,
+            self.config.twitter_access_token_secret
+        )
+        return tweepy.API(auth, wait_on_rate_limit=True)
     
     def scrape_post_content(self, url: str) -> Dict[str, str]:
         """Scrape the actual post content for better tweet generation"""
         try:
             logger.info(f"Scraping content from {url}")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=30)
+            response = SESSION.get(url, headers=_SCRAPE_HEADERS, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            head = BeautifulSoup(response.content, _HTML_PARSER, parse_only=_HEAD_STRAINER)
+            body = BeautifulSoup(response.content, _HTML_PARSER, parse_only=_EXCERPT_STRAINER)
             
             # Extract title
             title = None
-            title_selectors = ['h1.entry-title', 'h1.post-title', 'h1', 'title']
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
+            for selector in _TITLE_SELECTORS:
+                title_elem = selector.select_one(head)
                 if title_elem:
                     title = title_elem.get_text().strip()
                     break
             
             # Extract meta description
             description = None
-            desc_elem = soup.find('meta', {'name': 'description'})
+            desc_elem = head.find('meta', {'name': 'description'})
             if desc_elem:
                 description = desc_elem.get('content', '').strip()
             
             # Extract first paragraph or excerpt
             excerpt = None
-            excerpt_selectors = [
-                '.entry-excerpt', '.post-excerpt', '.excerpt',
-                '.entry-content p', '.post-content p', '.content p'
-            ]
-            for selector in excerpt_selectors:
-                excerpt_elem = soup.select_one(selector)
+            for selector in _EXCERPT_SELECTORS:
+                excerpt_elem = selector.select_one(body)
                 if excerpt_elem:
                     excerpt = excerpt_elem.get_text().strip()
                     # Clean up and limit length
-                    excerpt = re.sub(r'\s+', ' ', excerpt)
+                    excerpt = _WHITESPACE_RE.sub(' ', excerpt)
                     if len(excerpt) > 300:
                         excerpt = excerpt[:300] + '...'
                     break
@@ -108,37 +336,100 @@ class TweetGenerator:
                            previous_tweets: List[Dict]) -> str:
         """Generate tweet text using OpenAI"""
         
+        template_tweet = self._fast_path_tweet(post_data, style_params, previous_tweets)
+        if template_tweet:
+            return template_tweet
+        
         # Build the prompt
         prompt = self._build_prompt(post_data, style_params, previous_tweets)
         
-        try:
-            logger.info("Generating tweet with OpenAI")
-            logger.debug(f"Prompt: {prompt}")
-            
-            response = self.openai_client.chat.completions.create(
-                model=self.config.openai_model,
-                messages=[
-                    {"role": "system", "content": "You are a social media expert who writes engaging tweets to promote blog posts. You write in a natural, human voice that doesn't sound like AI-generated content."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=100,
-                temperature=0.8,  # Add some creativity
-                presence_penalty=0.6,  # Encourage variety
-                frequency_penalty=0.6  # Reduce repetition
-            )
-            
-            tweet_text = response.choices[0].message.content.strip()
-            
-            # Clean up the tweet text
-            tweet_text = self._clean_tweet_text(tweet_text, post_data['url'])
-            
-            logger.info(f"Generated tweet: {tweet_text}")
-            return tweet_text
-            
-        except Exception as e:
-            logger.error(f"Failed to generate tweet: {e}")
-            # Fallback to a simple template
-            return f"Check out this post: {post_data['title']} {post_data['url']}"
+        logger.debug(f"Prompt: {prompt}")
+        
+        for model in self._models():
+            try:
+                logger.info(f"Generating tweet with OpenAI ({model})")
+                
+                reservation = self.rate_limiter.acquire(expected_tokens=self._estimate_tokens(prompt))
+                response = self.openai_client.chat.completions.create(
+                    **self._completion_params(model, prompt)
+                )
+                return self._finish_completion(response, model, post_data, reservation)
+                
+            except Exception as e:
+                logger.error(f"Failed to generate tweet with {model}: {e}")
+        
+        # Fallback to a simple template
+        return self._template_tweet(post_data)
+    
+    def _models(self) -> List[str]:
+        """
+        Models to try in order: the primary (cheap) model first; the fallback
+        model is only billed when the primary call fails
+        """
+        models = [self.config.openai_model]
+        fallback_model = self.config.openai_fallback_model
+        if fallback_model and fallback_model != self.config.openai_model:
+            models.append(fallback_model)
+        return models
+    
+    def _estimate_tokens(self, prompt: str) -> int:
+        """Rough estimate: ~4 characters per prompt token plus the completion cap"""
+        return (len(self.system_prompt) + len(prompt)) // 4 + MAX_COMPLETION_TOKENS
+    
+    def _completion_params(self, model: str, prompt: str) -> Dict:
+        """Chat completion arguments for one model"""
+        return {
+            'model': model,
+            'messages': [
+                self._system_message,
+                {"role": "user", "content": prompt}
+            ],
+            'max_tokens': MAX_COMPLETION_TOKENS,
+            'temperature': 0.8,  # Add some creativity
+            'presence_penalty': 0.6,  # Encourage variety
+            'frequency_penalty': 0.6  # Reduce repetition
+        }
+    
+    def _fast_path_tweet(self, post_data: Dict, style_params: Dict,
+                         previous_tweets: List[Dict]) -> Optional[str]:
+        """
+        With TEMPLATE_FAST_PATH on, a templated tweet for the plain direct
+        style (no emojis or hashtags, concise), so OpenAI isn't called for it.
+        None for any other style, or if this post was already tweeted that way.
+        """
+        if not self.config.template_fast_path:
+            return None
+        if any(style_params.get(param) != value for param, value in self._TEMPLATE_STYLE.items()):
+            return None
+        
+        # Only fitted to length: the incomplete-sentence repair in
+        # _clean_tweet_text would cut words like 'Better' off real titles
+        tweet_text = self._fit_url(f"Read more: {post_data['title']}", post_data['url'])
+        if any(prev_tweet['tweet_text'] == tweet_text for prev_tweet in previous_tweets):
+            return None
+        
+        logger.info("Using templated tweet for the direct style (TEMPLATE_FAST_PATH)")
+        return tweet_text
+    
+    def _finish_completion(self, response, model: str, post_data: Dict, reservation: List) -> str:
+        """Record token usage and clean up the completion's tweet text"""
+        # Without usage the reserved estimate stays counted
+        if response.usage:
+            self.rate_limiter.record_tokens(reservation, response.usage.total_tokens)
+        
+        tweet_text = response.choices[0].message.content.strip()
+        
+        # Clean up the tweet text
+        tweet_text = self._clean_tweet_text(tweet_text, post_data['url'])
+        
+        # The text itself is logged once by the caller
+        logger.debug(f"Tweet generated with {model}")
+        return tweet_text
+    
+    @staticmethod
+    def _template_tweet(post_data: Dict) -> str:
+        """Simple tweet used when every model fails"""
+        return f"Check out this post: {post_data['title']} {post_data['url']}"
     
     def _build_prompt(self, post_data: Dict, style_params: Dict, 
                      previous_tweets: List[Dict]) -> str:
@@ -174,33 +465,6 @@ class TweetGenerator:
             prompt_parts.append("")
             prompt_parts.append("Your new tweet must use different wording, angle, and style than the above.")
         
-        prompt_parts.extend([
-            "",
-            "Requirements:",
-            f"- Must include the URL: {post_data['url']}",
-            "- Maximum 280 characters total",
-            "- Natural, human voice (not AI-sounding)",
-            "- Engaging and clickable",
-            "- DO NOT refer to the post as 'latest', 'new', or 'just published' unless it's from the last 7 days",
-            "- Focus on the content value rather than recency",
-            f"- Blog context: {self.config.blog_title} - {self.config.blog_description}",
-            "",
-            "CRITICAL WRITING RULES:",
-            "- COMPLETE ALL SENTENCES - never end with incomplete phrases like 'not', 'and', 'or', 'but'",
-            "- Every sentence must be grammatically complete and make sense on its own",
-            "- If approaching character limit, end with a complete sentence rather than an incomplete one",
-            "- Proofread the final tweet to ensure no dangling words or incomplete thoughts",
-            "",
-            "FORMATTING RULES:",
-            "- Use at least 2 line breaks to improve readability",
-            "- Avoid dense blocks of text - break content into digestible sections",
-            "- Format for easy scanning and readability",
-            "",
-            "GRAMMAR RULES:",
-            "- NO Oxford commas (do not use comma before 'and' in lists)",
-            "- NO em dashes (—) - use regular hyphens (-) or avoid dashes entirely"
-        ])
-        
         return "\n".join(prompt_parts)
     
     def _get_style_instructions(self, style_params: Dict) -> List[str]:
@@ -208,44 +472,21 @@ class TweetGenerator:
         instructions = []
         
         # Emoji style
-        emoji_style = style_params.get('emoji_style', 'none')
-        if emoji_style == 'none':
-            instructions.append("- Use no emojis")
-        elif emoji_style == 'minimal_1':
-            instructions.append("- Use exactly 1 emoji, placed naturally")
-        elif emoji_style == 'moderate_2-3':
-            instructions.append("- Use 2-3 emojis maximum, placed naturally")
-        elif emoji_style == 'enthusiastic_3+':
-            instructions.append("- Use 3+ emojis to show enthusiasm")
+        emoji_instruction = self._EMOJI_INSTRUCTIONS.get(style_params.get('emoji_style', 'none'))
+        if emoji_instruction:
+            instructions.append(emoji_instruction)
         
         # Tone
         tone = style_params.get('tone', 'conversational')
-        tone_instructions = {
-            'professional': "- Professional, authoritative tone",
-            'casual': "- Casual, friendly tone",
-            'enthusiastic': "- Enthusiastic, energetic tone",
-            'conversational': "- Conversational, approachable tone"
-        }
-        instructions.append(tone_instructions.get(tone, tone_instructions['conversational']))
+        instructions.append(self._TONE_INSTRUCTIONS.get(tone, self._TONE_INSTRUCTIONS['conversational']))
         
         # CTA style
         cta_style = style_params.get('cta_style', 'direct')
-        cta_instructions = {
-            'direct': "- Direct call-to-action (e.g., 'Read more:', 'Check it out:')",
-            'question': "- Use a question to create curiosity",
-            'intrigue': "- Create intrigue without giving everything away",
-            'benefit-focused': "- Focus on the benefit/value to the reader"
-        }
-        instructions.append(cta_instructions.get(cta_style, cta_instructions['direct']))
+        instructions.append(self._CTA_INSTRUCTIONS.get(cta_style, self._CTA_INSTRUCTIONS['direct']))
         
         # Length target
         length_target = style_params.get('length_target', 'medium_220')
-        length_instructions = {
-            'concise_180': "- Keep it concise, under 180 characters",
-            'medium_220': "- Aim for around 220 characters",
-            'full_280': "- Use the full 280 character limit if needed"
-        }
-        instructions.append(length_instructions.get(length_target, length_instructions['medium_220']))
+        instructions.append(self._LENGTH_INSTRUCTIONS.get(length_target, self._LENGTH_INSTRUCTIONS['medium_220']))
         
         # Hashtags
         if style_params.get('include_hashtags', False):
@@ -260,48 +501,58 @@ class TweetGenerator:
         # Remove quotes if the AI wrapped the response in quotes
         tweet_text = tweet_text.strip('"\'')
         
-        # Check for incomplete sentences that end abruptly
-        # Common patterns that indicate incomplete AI generation
-        incomplete_patterns = [
-            r'\b(not|and|or|but|so|yet|for|nor|with|to|from|in|on|at|by|of)\s*$',  # ends with preposition/conjunction
-            r'\b(smarter|better|faster|more|less|rather|quite|very|really|just)\s*$',  # ends with adverb/modifier
-            r'\b(the|a|an|this|that|these|those|my|your|our|their)\s*$',  # ends with article/determiner
-        ]
+        # Check for incomplete sentences that end abruptly and try to complete
+        # the sentence by removing the incomplete ending and adding a period
+        stripped_text = tweet_text.strip()
+        for pattern in INCOMPLETE_ENDING_PATTERNS:
+            if pattern.search(stripped_text):
+                logger.warning("Detected incomplete sentence in AI-generated tweet, attempting to fix...")
+                # Remove the incomplete ending
+                tweet_text = pattern.sub('', stripped_text).strip()
+                # Add proper punctuation if missing
+                if not tweet_text.endswith(('.', '!', '?', ':')):
+                    tweet_text += '.'
+                break
         
-        text_ends_incomplete = any(re.search(pattern, tweet_text.strip(), re.IGNORECASE) for pattern in incomplete_patterns)
-        
-        if text_ends_incomplete:
-            logger.warning("Detected incomplete sentence in AI-generated tweet, attempting to fix...")
-            # Try to complete the sentence by removing the incomplete ending and adding a period
-            for pattern in incomplete_patterns:
-                if re.search(pattern, tweet_text.strip(), re.IGNORECASE):
-                    # Remove the incomplete ending
-                    tweet_text = re.sub(pattern, '', tweet_text.strip(), flags=re.IGNORECASE).strip()
-                    # Add proper punctuation if missing
-                    if not tweet_text.endswith(('.', '!', '?', ':')):
-                        tweet_text += '.'
-                    break
+        return self._fit_url(tweet_text, post_url)
+    
+    @staticmethod
+    def _fit_url(tweet_text: str, post_url: str) -> str:
+        """Make sure the tweet includes the URL and fits Twitter's length limit"""
+        # Room left for text once the URL (and a space) is added
+        text_budget = MAX_TWEET_WEIGHT - _URL_WEIGHT - 1
         
         # Ensure URL is included
         if post_url not in tweet_text:
             # If there's room, add the URL
-            if len(tweet_text) + len(post_url) + 1 <= 280:
+            if _weighted_length(tweet_text) <= text_budget:
                 tweet_text = f"{tweet_text} {post_url}"
             else:
                 # Replace end of tweet with URL
-                max_text_length = 280 - len(post_url) - 1
-                tweet_text = tweet_text[:max_text_length].rsplit(' ', 1)[0] + f" {post_url}"
+                max_text_length = _weighted_prefix(tweet_text, text_budget)
+                tweet_text = _word_trim(tweet_text, max_text_length) + f" {post_url}"
         
         # Ensure it's not too long
-        if len(tweet_text) > 280:
+        if _weighted_length(tweet_text) > MAX_TWEET_WEIGHT:
             # Trim and add URL back
-            max_text_length = 280 - len(post_url) - 1
-            tweet_text = tweet_text[:max_text_length].rsplit(' ', 1)[0] + f" {post_url}"
+            max_text_length = _weighted_prefix(tweet_text, text_budget)
+            tweet_text = _word_trim(tweet_text, max_text_length) + f" {post_url}"
         
         return tweet_text
     
-    def post_tweet(self, tweet_text: str, image_url: Optional[str] = None) -> Optional[str]:
-        """Post tweet to Twitter and return tweet ID"""
+    def prepare_media(self, image_url: Optional[str]) -> List[str]:
+        """Upload an image ahead of posting and return its media IDs (no-op in test mode)"""
+        if self.test_mode or not image_url:
+            return []
+        
+        return self._upload_image(image_url)
+    
+    def post_tweet(self, tweet_text: str, image_url: Optional[str] = None,
+                   media_ids: Optional[List[str]] = None) -> Optional[str]:
+        """Post tweet to Twitter and return tweet ID
+        
+        Pass media_ids from prepare_media() if the image was already uploaded.
+        """
         if self.test_mode:
             logger.info("TEST MODE: Would post tweet:")
             logger.info(f"Text: {tweet_text}")
@@ -310,22 +561,26 @@ class TweetGenerator:
             return "test_tweet_id"
         
         try:
-            media_ids = []
+            # Handle image if provided and not uploaded already
+            if media_ids is None:
+                media_ids = self.prepare_media(image_url)
             
-            # Handle image if provided
-            if image_url:
-                media_ids = self._upload_image(image_url)
-                if not media_ids:
-                    logger.warning(f"Failed to upload image {image_url}, posting tweet without image")
+            if image_url and not media_ids:
+                logger.warning(f"Failed to upload image {image_url}, posting tweet without image")
             
-            # Post the tweet
+            # Post the tweet (rate limits are handled by wait_on_rate_limit).
+            # Only retried when the request never left this machine: after a
+            # server error or dropped connection it may already be posted.
+            tweet_kwargs = {'text': tweet_text}
             if media_ids:
-                response = self.twitter_client.create_tweet(
-                    text=tweet_text,
-                    media_ids=media_ids
-                )
-            else:
-                response = self.twitter_client.create_tweet(text=tweet_text)
+                tweet_kwargs['media_ids'] = media_ids
+            
+            response = retry_with_backoff(
+                lambda: self.twitter_client.create_tweet(**tweet_kwargs),
+                retry_on=(requests.ConnectionError,),
+                max_attempts=self.config.max_api_retries + 1,
+                retry_if=self._never_sent
+            )
             
             tweet_id = response.data['id']
             logger.info(f"Successfully posted tweet: {tweet_id}")
@@ -338,16 +593,26 @@ class TweetGenerator:
     def _upload_image(self, image_url: str) -> List[str]:
         """Download and upload image to Twitter"""
         try:
-            # Download the image
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            # Create a BytesIO object from the response content
-            # This gives us a file-like object that tweepy expects
-            image_file = BytesIO(response.content)
+            # Stream the image straight into the file-like object tweepy
+            # expects (it has to be seekable for type sniffing and retries),
+            # without holding a second copy in response.content
+            image_file = BytesIO()
+            with SESSION.get(image_url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, image_file)
             
             # Upload to Twitter using v1.1 API (v2 doesn't support media upload yet)
-            media = self.twitter_api.media_upload(filename="temp_image.jpg", file=image_file)
+            def upload():
+                image_file.seek(0)
+                return self.twitter_api.media_upload(filename="temp_image.jpg", file=image_file)
+            
+            media = retry_with_backoff(
+                upload,
+                retry_on=(tweepy.TweepyException,),
+                max_attempts=self.config.max_api_retries + 1,
+                retry_if=self._is_transient_upload_error
+            )
             return [media.media_id]
             
         except Exception as e: